@@ -1,47 +1,122 @@
 __lazy_modules__ = (
+    "csv",
+    "heapq",
+    "http.client",
+    "json",
+    "select",
     "socket",
+    "sqlite3",
+    "struct",
     "sys",
+    "threading",
+    "time",
     "base64",
+    "collections",
     "collections.abc",
+    "concurrent.futures",
+    "contextlib",
     "datetime ",
+    "functools",
     "ipaddress",
+    "pathlib",
     "typing ",
     "urllib.parse",
+    "urllib.request",
     "idna",
     "cryptography.exceptions",
     "cryptography.hazmat.primitives",
     "cryptography.hazmat.primitives.asymmetric.ec",
+    "cryptography.hazmat.primitives.asymmetric.ed448",
+    "cryptography.hazmat.primitives.asymmetric.ed25519",
+    "cryptography.hazmat.primitives.asymmetric.padding",
     "cryptography.hazmat.primitives.asymmetric.rsa",
+    "cryptography.hazmat.primitives.serialization",
+    "cryptography.hazmat.primitives.serialization.pkcs7",
     "cryptography.x509",
     "cryptography.x509.certificate_transparency",
+    "cryptography.x509.ocsp",
+    "cryptography.x509.oid",
     "OpenSSL",
 )
 
+import csv
+import heapq
+import http.client
+import json
+import select
 import socket
+import sqlite3
+import struct
 import sys
-from base64 import b64encode
+import threading
+import time
+import urllib.request
+from base64 import b64decode, b64encode
+from collections import Counter
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing, nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import cache, lru_cache
 from ipaddress import IPv4Address, IPv6Address, ip_address
-from typing import Any
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
 from urllib.parse import urlsplit
 
 import click
 import idna
-from cryptography.exceptions import InvalidSignature
+from click.core import ParameterSource
+from cryptography.exceptions import InvalidSignature, UnsupportedAlgorithm
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric.ec import EllipticCurvePublicKey
+from cryptography.hazmat.primitives.asymmetric.ec import ECDSA, EllipticCurvePublicKey
+from cryptography.hazmat.primitives.asymmetric.ed448 import Ed448PublicKey
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    PublicFormat,
+    load_der_public_key,
+)
+from cryptography.hazmat.primitives.serialization.pkcs7 import (
+    load_der_pkcs7_certificates,
+)
 from cryptography.x509 import (
+    AuthorityInformationAccess,
     BasicConstraints,
     Certificate,
-    GeneralName,
+    ExtendedKeyUsage,
+    ExtensionNotFound,
     PolicyInformation,
+    PrecertificateSignedCertificateTimestamps,
+    SubjectKeyIdentifier,
+    UniformResourceIdentifier,
+    load_der_x509_certificate,
+    load_pem_x509_certificates,
+)
+from cryptography.x509.certificate_transparency import (
+    LogEntryType,
+    SignedCertificateTimestamp,
+)
+from cryptography.x509.ocsp import (
+    OCSPCertStatus,
+    OCSPRequestBuilder,
+    OCSPResponse,
+    OCSPResponseStatus,
+    load_der_ocsp_response,
+)
+from cryptography.x509.oid import (
+    AuthorityInformationAccessOID,
+    ExtendedKeyUsageOID,
+    SignatureAlgorithmOID,
 )
-from cryptography.x509.certificate_transparency import SignedCertificateTimestamp
 from OpenSSL import SSL, crypto
 
+if TYPE_CHECKING:
+    # cryptography >= 43
+    from cryptography.x509.ocsp import OCSPSingleResponse
+
 __version__ = "2026.6.27"
 
 BAD_BUYPASS_CERTS = [
@@ -354,12 +429,158 @@ KNOWN_LOGS = {
     "mueOgrUnqTLVe4NZadQv4/Ah4TKZis8cN3oV+x5FLFo=": "WoTrus 3",
 }
 
+# The DER encoded public keys of the logs, by log ID. Kept up to date
+# by updatectlogs.py, so only logs still in the log list are here.
+KNOWN_LOG_KEYS: dict[str, str] = {
+    "+X6XuNM+96FZAqU6GeF5kOXcQGoDGCW6rZPpj5ucacs=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEK9Y56IP6DGQy2d9moYGJChZPoktXoYwaG0MBN/4X5MSFmBaYJfNm3mCwzLVefkjh2wz8Q6q2S75hS/OeHGiZUg==",
+    "+tTJfMSe4vishcXqXOoJ0CINu/TknGtQZi/4aPhrjCg=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEVG18id3qnfC6X/RtYHo3TwIlvxz2b4WurxXfaW7t26maKZfymXYe5jNGHif0vnDdWde6z/7Qco6wVw+dN4liow==",
+    "/kRhCLHQGreKYsz+q2qysrq/86va2ApNizDfLQAIgww=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEX+0nudCKImd7QCtelhMrDW0OXni5RE10tiiClZesmrwUk2iHLCoTHHVV+yg5D4n/rxCRVyRhikPpVDOLMLxJaA==",
+    "23Sv7ssp7LH+yj5xbSzluaq7NveEcYPHXZ1PN7Yfv2Q=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEAsVpWvrH3Ke0VRaMg9ZQoQjb5g/xh1z3DDa6IuxY5DyPsk6brlvrUNXZzoIg0DcvFiAn2kd6xmu4Obk5XA/nRg==",
+    "23b9raxl59CVCIhuIVm9i5A1L1/q0+PcXiLrNQrMe5g=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAELPXCMfVjQ2oWSgrewu4fIW4Sfh3lco90CwKZ061pvAI1eflh6c8ACE90pKM0muBDHCN+j0HV7scco4KKQPqq4A==",
+    "2AlVO5RPev/IFhlvlE+Fq7D4/F6HVSYPFdEucrtFSxQ=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE5Xd4lXEos5XJpcx6TOgyA5Z7/C4duaTbQ6C9aXL5Rbqaw+mW1XDnDX7JlRUninIwZYZDU9wRRBhJmCVopzwFvw==",
+    "36Veq2iCTx9sre64X04+WurNohKkal6OOxLAIERcKnM=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEhjyxDVIjWt5u9sB/o2S8rcGJ2pdZTGA8+IpXhI/tvKBjElGE5r3de4yAfeOPhqTqqc+o7vPgXnDgu/a9/B+RLg==",
+    "3dzKNJXX4RYF55Uy+sef+D0cUN/bADoUEnYKLKy7yCo=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEa+Cv7QZ8Pe/ZDuRYSwTYKkeZkIl6uTaldcgEuMviqiu1aJ2IKaKlz84rmhWboD6dlByyt0ryUexA7WJHpANJhg==",
+    "3esdK3oNT6Ygi4GtgWhwfi6OnQHVXIiNPRHEzbbsvsw=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEluqsHEYMG1XcDfy1lCdGV0JwOmkY4r87xNuroPS2bMBTP01CEDPwWJePa75y9CrsHEKqAy8afig1dpkIPSEUhg==",
+    "4BJ2KekEllZOPQFHmESYqkj4rbFmAOt5AqHvmQmQYnM=": "MIIBIjANBgkqhkiG9w0BAQEFAAOCAQ8AMIIBCgKCAQEArM8vS3Cs8Q2Wv+gK/kSd1IwXncOaEBGEE+2M+Tdtg+QAb7FLwKaJx2GPmjS7VlLKA1ZQ7yR/S0npNYHd8OcX9XLSI8XjE3/Xjng1j0nemASKY6+tojlwlYRoS5Ez/kzhMhfC8mG4Oo05f9WVgj5WGVBFb8sIMw3VGUIIGkhCEPFow8NBE8sNHtsCtyR6UZZuvAjqaa9t75KYjlXzZeXonL4aR2AwfXqArVaDepPDrpMraiiKpl9jGQy+fHshY0E4t/fodnNrhcy8civBUtBbXTFOnSrzTZtkFJkmxnH4e/hE1eMjIPMK14tRPnKA0nh4NS1K50CZEZU01C9/+V81NwIDAQAB",
+    "4mR/bto0BQPGTU4QqGloH96cWizzsy1fIAuWNgWQiCM=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEBQLIGtQH3merk2OMO2LbKU2TFroKxaChr4+FxB5UMLYTspqEJKcD7mRXEObHJ6PI/39UvEI98N4Cyf9x2rKvqg==",
+    "4mlLribo6UAJ6IYbtjuD1D7n/nSI+6SPKJMBnd3x2/4=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEkZd/ow8X+FSVWAVSf8xzkFohcPph/x6pS1JHh7g1wnCZ5y/8Hk6jzJxs6t3YMAWz2CPd4VkCdxwKexGhcFxD9A==",
+    "5xLysDd+GmL7jskMYYTx6ns3y1YdESZb8+DzS/JBVG4=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEfzb42Zdr/h7hgqgDCo1vrNJqGqbcUvJGJEER9DDqp19W/wFSB0l166hD+U5cAXchpH8ZkBNUuvOHS0OnJ4oJrQ==",
+    "6D7Q2j71BjUy51covIlryQPTy9ERa+zraeF3fW0GvW4=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE0JCPZFJOQqyEti5M8j13ALN3CAVHqkVM4yyOcKWCu2yye5yYeqDpEXYoALIgtM3TmHtNlifmt+4iatGwLpF3eA==",
+    "7TxL1ugGwqSiAFfbyyTiOAHfUS/txIbFcA8g3bc+P+A=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE4NtB7+QEvctrLkzM8WzeQVh//pT2evZg7Yt2cqOiHDETMjWh8gjSaMU0p1YIHGPeleKBaZeNHqi3ZlEldU14Lg==",
+    "7ku9t3XOYLrhQmkfq+GeZqMPfl+wctiDAMR7iXqo/cs=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEIFsYyDzBi7MxCAC/oJBXK7dHjG+1aLCOkHjpoHPqTyghLpzA9BYbqvnV16mAw04vUjyYASVGJCUoI3ctBcJAeg==",
+    "7sCV7o1yZA+S48O5G8cSo2lqCXtLahoUOOZHssvtxfk=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE9o7AiwrbGBIX6Lnc47I6OfLMdZnRzKoP5u072nBi6vpIOEooktTi1gNwlRPzGC2ySGfuc1xLDeaA/wSFGgpYFg==",
+    "8JWkWfIA0YJAEC0vk4iOrUv+HUfjmeHQNKawqKqOsnM=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEURAG+Zo0ac3n37ifZKUhBFEV6jfcCzGIRz3tsq8Ca9BP/5XUHy6ZiqsPaAEbVM0uI3Tm9U24RVBHR9JxDElPmg==",
+    "9lyUL9F3MCIUVBgIMJRWjuNNExkzv98MLyALzE7xZOM=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAETeBmZOrzZKo4xYktx9gI2chEce3cw/tbr5xkoQlmhB18aKfsxD+MnILgGNl0FOm0eYGilFVi85wLRIOhK8lxKw==",
+    "AwGd8/2FppqOvR+sxtqbpz5Gl3T+d/V5/FoIuDKMHWs=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEjicnerZVCXTrbEuUhGW85BXx6lrYfA43zro/bAna5ymW00VQb94etBzSg4j/KS/Oqf/fNN51D8DMGA2ULvw3AQ==",
+    "B7dcG+V9aP/xsMYdIxXHuuZXfFeUt2ruvGE6GmnTohw=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEZU75VqjyzSTgFZKAnWg1QeYfFFIRZTMK7q3kWWZsmHhQdrBYnHRZ3OA4kUeUx0JN+xX+dSgt1ruqUhhl7jOvmw==",
+    "C3YOmouaaC+ImFsV6UdQGlZEa7qIMHhcOEKZQ4ZFDAA=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEJUwGinXUWVNaBiK2Vl/rdyMkxKaWJHR8dj9yD5AlZEtEbfvAMQQ8o7DQyXVm7TX+eAA9wL2Vtt6DpoMEL0q/rw==",
+    "CEEUmABxUywWGQRgvPxH/cJlOvopLHKzf/hjrinMyfA=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE/XyDwqzXL9i2GTjMYkqaEyiRL0Dy9sHq/BTebFdshbvCaXXEh6mjUK0Yy+AsDcI4MpzF1l7Kded2MD5zi420gA==",
+    "FDCNkMzQMBNQBcAcpSbYHoTodiTjm2JI4I9ySuo7tCo=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEx6zC8wCbMs3fpQWnSCeo2RvG827AEssGkMa+5RVIpRF0SDO4hFsn2Ph1l8marSCuwVLhv0JIN3arSzbUieX6HA==",
+    "FZcEiNe5l6Bb61JRKt7o0ui0oxZSZBIan6v71fha2T8=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEowJkhCK7JewN47zCyYl93UXQ7uYVhY/Z5xcbE4Dq7bKFN61qxdglnfr0tPNuFiglN+qjN2Syxwv9UeXBBfQOtQ==",
+    "H7w24ALt6X9AGZ6Gs1c7ikIX2AGHdGrQ2gOgYFTSDfQ=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE15ypB40iQe6ToFJB2vSA8CW86/rzPNJ+kdg/LNpRvcjuKnLj/xhW5DoiDyI8xtUws5toLqtWwkFf1mRXFLFarw==",
+    "H8cs5aG3mfQAw1m/+WyjkTVI6GRCIGEJUum6F3T3usc=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEiKfWtuoWCPMEzSKySjMjXpo38WOdZr6Yq0WYa2JQOv1uVMxkqHywf9Gz1kGeRLq/Rz3tVVvXgqb4jQ1UqKVKnw==",
+    "HQJLjrFJizRN/YfqPvwJlvdQbyNdHUlwYaR3PEOcJfs=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEbgwcuu4rakGFYB17fqsILPwMCqUIsz7VcCTRbR0ttrfzizbcI02VYxK75IaNzOnR7qFAot8LowYKMMqNrKQpVg==",
+    "IkVFB1lVJFaWP6Ev8fdthuAjJmOtwEt/XcaDXG7iDwI=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEn/jYHd77W1G1+131td5mEbCdX/1v/KiYW5hPLcOROvv+xA8Nw2BDjB7y+RGyutD2vKXStp/5XIeiffzUfdYTJg==",
+    "KTxRllTIOWW6qlD8WAfUt2+/WHopctykwwz05UVH9Hg=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAETtK8v7MICve56qTHHDhhBOuV4IlUaESxZryCfk9QbG9co/CqPvTsgPDbCpp6oFtyAHwlDhnvr7JijXRD9Cb2FA==",
+    "KWr6LVaLyg0uqESVaulyH8Nfo1Xs2plpOq/UWKca790=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEHxoVg3cAdWK5n/YGBe2ViYNBgZfn4NQz/na6O8lJws3xz/4ScNe+qCJfsqRnAntxrh2sqOnRCNXO7zN6w18A3A==",
+    "KXm+8J45OSHwVnOfY6V35b5XfZxgCvj5TV0mXCVdx4Q=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEeIPc6fGmuBg6AJkv/z7NFckmHvf/OqmjchZJ6wm2qN200keRDg352dWpi7CHnSV51BpQYAj1CQY5JuRAwrrDwg==",
+    "MtxZwtTEGWjVbhS8YayPDkXbOfrzwVWqQlL1AB+gxiM=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEsY4diqo6rM6Gy1N26KidWb4XiAMH8ifggr6x/Gc7Ru7T8Y3Wd+ijtNsJXKAJQ/xf0Gg0IyQIwk/Y0rad7dWM2w==",
+    "NLtq1sPfnAPuqKSZ/3iRSGydXlysktAfe/0bzhnbSO8=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAESPNZ8/YFGNPbsu1Gfs/IEbVXsajWTOaft0oaFIZDqUiwy1o/PErK38SCFFWa+PeOQFXc9NKv6nV0+05/YIYuUQ==",
+    "Nc8ZG7+xbFe/D61MbULLu7YnICZR6j/hKu+oA8M71kw=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEfQ0DsdWYitzwFTvG3F4Nbj8Nv5XIVYzQpkyWsU4nuSYlmcwrAp6m092fsdXEw6w1BAeHlzaqrSgNfyvZaJ9y0Q==",
+    "OTdvVF97Rgf1l0LXaM1dJDe/NHO2U0pINLz3Lmgcg8k=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEovftE+HTXAIIxI6Lm4s7OWjHkmo4oU8jxaVvb9dlgfjBm/SfqYtF9LlOG8miaReleIfZzohvQQO7oyrjd5eNeA==",
+    "QbLcLonmPOSvG6e7Kb9oxt7m+fHMBH4w3/rjs7olkmM=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEzBGIey1my66PTTBmJxklIpMhRrQvAdPG+SvVyLpzmwai8IoCnNBrRhgwhbrpJIsO0VtwKAx+8TpFf1rzgkJgMQ==",
+    "QcjKsd8iRkoQxqE6CUKHXk4xixsD6+tLx2jwkGKWBvY=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAESLJHTlAycmJKDQxIv60pZG8g33lSYxYpCi5gteI6HLevWbFVCdtZx+m9b+0LrwWWl/87mkNN6xE0M4rnrIPA/w==",
+    "R0RHfHXeQm1cRO/UqSyWd1l/ZXqP4MrbxtYW7aSXxCU=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE+nuP0XjE36o+HfjS9IKnDItCnp3Tn9NafZpJ/8GHvLm+Z/AXY7FuN3L4LPXRrlTydBLt60OqzktHoJ4t4fNodg==",
+    "RJRlLrDuzq/EQAfYqP4owNrmgr7YyzG1P9MzlrW2gag=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAExpon7ipsqehIeU1bmpog9TFo4Pk8+9oN8OYHl1Q2JGVXnkVFnuuvPgSo2Ep+6vLffNLcmEbxOucz03sFiematg==",
+    "RqVV63X6kSAwtaKJafTzfREsQXS+/Um4havy/HD+bUc=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE+WS9FSxAYlCVEzg8xyGwOrmPonoV14nWjjETAIdZvLvukPzIWBMKv6tDNlQjpIHNrUcUt1igRPpqoKDXw2MeKw==",
+    "U3tpo1ZDNanASQTjlZOywpjrjXpugwI2NcYnJIzWtEA=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE4qWq6afhBUi0OdcWUYhyJLNXTkGqQ9PMS5lqoCgkV2h1ZvpNjBH2u8UbgcOQwqDo66z6BWQJGolozZYmNHE2kQ==",
+    "UaOw9f0BeZxWbbg3eI8MpHrMGyfL956IQpoN/tSLBeU=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEJyTdaAMoy/5jvg4RR019F2ihEV1McclBKMe2okuX7MCv/C87v+nxsfz1Af+p+0lADGMkmNd5LqZVqxbGvlHYcQ==",
+    "UutLIl7IlpdIUGdfI+Q7wdAh4yFM5S7NX6h8IDzfygM=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEEuFqn5cy1nACARlWIUjeJaRDKl0mcf9gvFZXpPhHsyykizXvULF5GZNGfucWIyUccBRfmYJZTTrXqw0mVts7hA==",
+    "VYHUwhaQNgFK6gubVzxT8MDkOHhwJQgXL6OqHQcT0ww=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE8m/SiQ8/xfiHHqtls9m7FyOMBg4JVZY9CgiixXGz0akvKD6DEL8S0ERmFe9U4ZiA0M4kbT5nmuk3I85Sk4bagA==",
+    "VhQGmi/XwuzT9eG9RLI+x0Z2ubyZEVzA75SYVdaJ0N0=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEAkbFvhu7gkAW6MHSrBlpE1n4+HCFRkC5OLAjgqhkTH+/uzSfSl8ois8ZxAD2NgaTZe1M9akhYlrYkes4JECs6A==",
+    "XNxDkv7mq0VEsV6a1FbmEDf71fpH3KFzlLJe5vbHDso=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE6J4EbcpIAl1+AkSRsbhoY5oRTj3VoFfaf1DlQkfi7Rbe/HcjfVtrwN8jaC+tQDGjF+dqvKhWJAQ6Q6ev6q9Mew==",
+    "Xqdz+d9WwOe1Nkh90EngMnqRmgyEoRIShBh1loFxRVg=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE01EAhx4o0zPQrXTcYjgCt4MVFsT0Pwjzb1RwrM0lhWDlxAYPP6/gyMCXNkOn/7KFsjL7rwk78tHMpY8rXn8AYg==",
+    "Y/Lbzeg7zCzPC3KEJ1drM6SNYXePvXWmOLHHaFRL2I0=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEI3MQm+HzXvaYa2mVlhB4zknbtAT8cSxakmBoJcBKGqGwYS0bhxSpuvABM1kdBTDpQhXnVdcq+LSiukXJRpGHVg==",
+    "Y9AAYCbd4QuwYB9FJEaWXuK26izU+8layGalUK+Qdbc=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEpYzoNS6O5Wp1rVxLMWEpnTBXjgITX+nKu1KoQwVgvw1zV3eyBdhn9vAzyflE3rZTc6oMVcKDCkvOXhrHFx2zzQ==",
+    "ZZszUPQ7EsxepatOx2XT/ebIgkN3d3jnIAP56yuMMSk=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEFkqNKRuZ+Z8IOsnNJrUZ8gwp+KKGOdQrJ/HKhSadK/SJuoCc9+dxQ7awpmWIMr9SKcQeG5uRzG1kVSyFN4Wfcw==",
+    "ZjywnB/Nm6pidjzLU07sgFgSKAUHrGmkX804z0zHTPE=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEQ4UlFLE3vxDHtsqO5s6kNURSyaLK9bHV5+zDXTQzwiUJdTFKxE85L5uvYvobuyZpySo7GXYyopL4Exsrm4HJMA==",
+    "aPaY+B9kgr46jO65KB1M/HFRXWeT1ETRCmesu09P+8Q=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE1/TMabLkDpCjiupacAlP7xNi0I1JYP8bQFAHDG1xhtolSY1l4QgNRzRrvSe8liE+NPWHdjGxfx3JhTsN9x8/6Q==",
+    "aXqvyhprU2+uISBQRt661+Dq6hPSQy5unY+zefK5qvM=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEFWj6UQDxzHWmgzQtQQ7REDC0nxnU9mpOmA0lv5trA0t7IRzSkh4DOznPe+nkxmaC8iS1capCtKjyYhUNRrvWqA==",
+    "b/FBtWR+QiL37wUs7658If1gjifSr1pun0uKN9ZjPuU=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEVqpLa2W+Rz1XDZPBIyKJO+KKFOYZTj9MpJWnZeFUqzc5aivOiWEVhs8Gy2AlH3irWPFjIZPZMs3Dv7M+0LbPyQ==",
+    "b1N2rDHwMRnYmQCkURX/dxUcEdkCwQApBo2yCJo32RM=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE7+R9dC4VFbbpuyOL+yy14ceAmEf7QGlo/EmtYU6DRzwat43f/3swtLr/L8ugFOOt1YU/RFmMjGCL17ixv66MZw==",
+    "cX6nQgl1voSicjVT8Xd8Jt1Rr04QIUQJTZAZtGL7Zmg=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEzVH/qe+rgr/Mo+owQ00I6aegDSjHttgqQBmg+hBdTXXLgJT/+8LdSgjfY/8lOBtfivndJzQlTNQ9Le1cU6wXNQ==",
+    "dGG0oJz7PUHXUVlXWy52SaRFqNJ3CbDMVkpkgrfrQaM=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEJ2Q5DC3cUBj4IQCiDu0s6j51up+TZAkAEcQRF6tczw90rLWXkJMAW7jr9yc92bIKgV8vDXU4lDeZHvYHduDuvg==",
+    "dH7agzGtMxCRIZzOJU9CcMK//V5CIAjGNzV55hB7zFY=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEkZHz1v5r8a9LmXSMegYZAg4UW+Ug56GtNfJTDNFZuubEJYgWf4FcC5D+ZkYwttXTDSo4OkanG9b3AI4swIQ28g==",
+    "ejKMVNi3LbYg6jjgUh7phBZwMhOFTTvSK8E6V6NS61I=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEi/8tkhjLRp0SXrlZdTzNkTd6HqmcmXiDJz3fAdWLgOhjmv4mohvRhwXul9bgW0ODgRwC9UGAgH/vpGHPvIS1qA==",
+    "fT7y+I//iFVoJMLAyp5SiXkrxQ54CX8uapdomX4i8Nc=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAER+1MInu8Q39BwDZ5Rp9TwXhwm3ktvgJzpk/r7dDgGk7ZacMm3ljfcoIvP1E72T8jvyLT1bvdapylajZcTH6W5g==",
+    "h3W/51l8+IxDmV+9827/Vo1HVjb/SrVgwbTq/16ggw8=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEzF05L2a4TH/BLgOhNKPoioYCrkoRxvcmajeb8Dj4XQmNY+gxa4Zmz3mzJTwe33i0qMVp+rfwgnliQ/bM/oFmhA==",
+    "iUFEnHB0Lga5/JznsRa6ACSqNtWa9E8CBEBPAPfqhWY=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE18gOIz6eAjyauAdKKgX/SkuI1IpNOc73xfK2N+mj7eT1RQkOZxT9UyTVOpTy6rUT2R2LXKfD82vYPy07ZXJY1g==",
+    "kkow+Qkzb/Q11pk6EKx1osZBco5/wtZZrmGI/61AzgE=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEW0rHAbd0VLpAnEN1lD+s77NxVrjT4nuuobE+U6qXM6GCu19dHAv6hQ289+Wg4CLwoInZCn9fJpTTJOOZLuQVjQ==",
+    "lCC8Ho7VjWyIcx+CiyIsDdHaTV5sT5Q9YdtOL1hNosI=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAELsYzGMNwo8rBIlaklBIdmD2Ofn6HkfrjK0Ukz1uOIUC6Lm0jTITCXhoIdjs7JkyXnwuwYiJYiH7sE1YeKu8k9w==",
+    "lgbALGkAM6odFF9ZxuJkjQVJ8N+WqrjbkVpw2OzzkKU=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEQ3nrSVxQKkpqj1mTvMNCdsKZ+CeBPAZs0sgEj3R7tLUh8uOo3DO5/iXpPQT8P7SuQONFfoSSKthS6x8/cxPQyA==",
+    "lpdkv1VYl633Q4doNwhCd+nwOtX2pPM2bkakPw/KqcY=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEOh/Iu87VkEc0ysoBBCchHOIpPZK7kUXHWj6l1PIS5ujmQ7rze8I4r/wjigVW6wMKMMxjbNk8vvV7lLqU07+ITA==",
+    "nk/3PcPOIgtpIXyJnkaAdqv414Y21cz8haMadWKLqIs=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE1+wvK3VPN7yjQ7qLZWY8fWrlDCqmwuUm/gx9TnzwOrzi0yLcAdAfbkOcXG6DrZwV9sSNYLUdu6NiaX7rp6oBmw==",
+    "o8mYRegKt84AFXs3Qt8CB90nKytgLs+Y7iwS25xa5+c=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE1glwxqXsw2VqlAbHSeWbTthMGNIuACVn8Jj/jrnY2iN2uVUrEEwLj5VUCb+WF2XY44+mfUVYY7R/d8TIZ4olnw==",
+    "p85KTmIH4K3e5f2qSx+GdodntdACpV1HMQ5+ZwqV6rI=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEloIeo806gIQel7i3BxmudhoO+FV2nRIzTpGI5NBIUFzBn2py1gH1FNbQOG7hMrxnDTfouiIQ0XKGeSiW+RcemA==",
+    "pFASaQVaFVReYhGrN7wQP2KuVXakXksXFEU+GyIQaiU=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE0gBVBa3VR7QZu82V+ynXWD14JM3ORp37MtRxTmACJV5ZPtfUA7htQ2hofuigZQs+bnFZkje+qejxoyvk2Q1VaA==",
+    "pLkJkLQYWBSHuxOizGdwCjw1mAT5G9+443fNDsgN3BA=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEfahLEimAoz2t01p3uMziiLOl/fHTDM0YDOhBRuiBARsV4UvxG2LdNgoIGLrtCzWE0J5APC2em4JlvR8EEEFMoA==",
+    "pXesnO11SN2PAltnokEInfhuD0duwgPC7L7bGF8oJjg=": "MIIBIjANBgkqhkiG9w0BAQEFAAOCAQ8AMIIBCgKCAQEAv7UIYZopMgTTJWPp2IXhhuAf1l6a9zM7gBvntj5fLaFm9pVKhKYhVnno94XuXeN8EsDgiSIJIj66FpUGvai5samyetZhLocRuXhAiXXbDNyQ4KR51tVebtEq2zT0mT9liTtGwiksFQccyUsaVPhsHq9gJ2IKZdWauVA2Fm5x9h8B9xKn/L/2IaMpkIYtd967TNTP/dLPgixN1PLCLaypvurDGSVDsuWabA3FHKWL9z8wr7kBkbdpEhLlg2H+NAC+9nGKx+tQkuhZ/hWR65aX+CNUPy2OB9/u2rNPyDydb988LENXoUcMkQT0dU3aiYGkFAY0uZjD2vH97TM20xYtNQIDAQAB",
+    "qJnYeAySkKr0YvMYgMz71SRR6XDQ+/WR73Ww2ZtkVoE=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEOfifIGLUV1Voou9JLfA5LZreRLSUMOCeeic8q3Dw0fpRkGMWV0Gtq20fgHQweQJeLVmEByQj9p81uIW4QkWkTw==",
+    "qucLfzy41WbIbC8Wl5yfRF9pqw60U1WJsvd6AwEE880=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE9UV9+jO2MCTzkabodO2F7LM03MUBc8MrdAtkcW6v6GA9taTTw9QJqofm0BbdAsbtJL/unyEf0zIkRgXjjzaYqQ==",
+    "rDua7X+pZ0dXFZ5tfVdWcvnZgQCUHpve/+yhMTt1eC0=": "MIIBIjANBgkqhkiG9w0BAQEFAAOCAQ8AMIIBCgKCAQEAolpIHxdSlTXLo1s6H1OCdpSj/4DyHDc8wLG9wVmLqy1lk9fz4ATVmm+/1iN2Nk8jmctUKK2MFUtlWXZBSpym97M7frGlSaQXUWyA3CqQUEuIJOmlEjKTBEiQAvpfDjCHjlV2Be4qTM6jamkJbiWtgnYPhJL6ONaGTiSPm7Byy57iaz/hbckldSOIoRhYBiMzeNoA0DiRZ9KmfSeXZ1rB8y8X5urSW+iBzf2SaOfzBvDpcoTuAaWx2DPazoOl28fP1hZ+kHUYvxbcMjttjauCFx+JII0dmuZNIwjfeG/GBb9frpSX219k1O4Wi6OEbHEr8at/XQ0y7gTikOxBn/s5wQIDAQAB",
+    "rKswcGzr7IQx9BPS9JFfER5CJEOx8qaMTzwrO6ceAsM=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEanCds5bj7IU2lcNPnIvZfMnVkSmu69aH3AS8O/Y0D/bbCPdSqYjvuz9Z1tT29PxcqYxf+w1g5CwPFuwqsm3rFQ==",
+    "rfe++nz/EMiLnT2cHj4YarRnKV3PsQwkyoWGNOvcgoo=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEchY+C+/vzj5g3ZXLY3q5qY1Kb2zcYYCmRV4vg6yU84WI0KV00HuO/8XuQqLwLZPjwtCymeLhQunSxgAnaXSuzg==",
+    "s3N3B+GEUPhjhtYFqdwRCUp5LbFnDAuH3PADDnk2pZo=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEEXu8iQwSCRSf2CbITGpUpBtFVt8+I0IU0d1C36Lfe1+fbwdaI0Z5FktfM2fBoI1bXBd18k2ggKGYGgdZBgLKTg==",
+    "sLeEvIHA3cR1ROiD8FmFu5B30TTYq4iysuUzmAuOUIs=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEWTmyppTGMrn+Y2keMDujW9WwQ8lQHpWlLadMSkmOi4+3+MziW5dy1eo/sSFI6ERrf+rvIv/f9F87bXcEsa+Qjw==",
+    "sMyD5aX5fWuvfAnMKEkEhyrH6IsTLGNQt8b9JuFsbHc=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEw8i8S7qiGEs9NXv0ZJFh6uuOmR2Q7dPprzk9XNNGkUXjzqx2SDvRfiwKYwBljfWujozHESVPQyydGaHhkaSz/g==",
+    "sQzVWabWeEaBH335pRUyc5rEjXA76gMj2l04dVvArU4=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE1syJvwQdrv0a8dM2VAnK/SmHJNw/+FxC+CncFcnXMX2jNH9Xs7Q56FiV3taG5G2CokMsizhpcm7xXzuR3IHmag==",
+    "sh4FzIuizYogTodm+Su5iiUgZ2va+nDnsklTLe+LkF4=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE6Tx2p1yKY4015NyIYvdrk36es0uAc1zA4PQ+TGRY+3ZjUTIYY9Wyu+3q/147JG4vNVKLtDWarZwVqGkg6lAYzA==",
+    "u9nfvB+KcbWTlCOXqpJ7RzhXlQqrUugakJZkNo4e0YU=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEEmyGDvYXsRJsNyXSrYc9DjHsIa2xzb4UR7ZxVoV6mrc9iZB7xjI6+NrOiwH+P/xxkRmOFG6Jel20q37hTh58rA==",
+    "vHjh38X2PGhGSTNNoQ+hXwl5aSAJwIG08/aRfz7ZuKU=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE6pWeAv/u8TNtS4e8zf0ZF2L/lNPQWQc/Ai0ckP7IRzA78d0NuBEMXR2G3avTK0Zm+25ltzv9WWis36b4ztIYTQ==",
+    "w78Dp+HKiEHGB7rj/0Jw/KXsRbGG675OLPP8d4Yw9fY=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEKATl2B3SAbxyzGOfNRB+AytNTGvdF/FFY6HzWb+/HPE4lJ37vx2nEm99KYUy9SoNzF5VyTwCQG5nL/c5Q77yQQ==",
+    "wRZK4Kdy0tQ5LcgKwQdw1PDEm96ZGkhAwfoHUWT2M2A=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAESYlKFDLLFmA9JScaiaNnqlU8oWDytxIYMfswHy9Esg0aiX+WnP/yj4O0ViEHtLwbmOQeSWBGkIu9YK9CLeer+g==",
+    "xlKg7EjOs/yrFwmSxDqHQTMJ6ABlomJSQBujNioXxWU=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE4hHIyMVIrR9oShgbQMYEk8WX1lmkfFKB448Gn93KbsZnnwljDHY6MQqEnWfKGgMOq0gh3QK48c5ZB3UKSIFZ4g==",
+    "xtftntuOdPCnG01KmEvL66u9KMwf12Mp6IcmzUwlRmM=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEYFtlqKC59Iy+N1sWaUktnSNpbhrrL4VMiaqdDrQu/3hOnxOJiXFlkSYQjBoHDCVA5iC9pu8+1DsrmNsv5FIMDw==",
+    "yc+JCiEQnGZswXo+0GXJMNDgE1qf66ha8UIQuAckIao=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAErQ8wrZ55pDiJJlSGq0FykG/7yhemrO7Gn30CBexBqMdBnTJJrbA5vTqHPnzuaGxg0Ucqk67hQPQLyDU8HQ9l0w==",
+    "yzj3FYl8hKFEX1vB3fvJbvKaWc1HCmkFhbDLFMMUWOc=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAE2FxhT6xq0iCATopC9gStS9SxHHmOKTLeaVNZ661488Aq8tARXQV+6+jB0983v5FkRm4OJxPqu29GJ1iG70Ahow==",
+    "z1XiiSNJfDQNUgbQU1Ouslg0tS8fjclSaAnyEu/dfKY=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEEalgK7RxRWbgLt7VhzvV/vCSN/RoxpLdPxrivAwi1pljKW4yKBTAdiyAqCJRkdbrptjx7PAHfrD8dnB2cnyR6Q==",
+    "zPsPaoVxCWX+lZtTzumyfCLphVwNl422qX5UwP5MDbA=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAEGoAaFRkZI3m0+qB5jo3VwdzCtZaSfpTgw34UfAoNLUaonRuxQWUMX5jEWhd5gVtKFEHsr6ldDqsSGXHNQ++7lw==",
+    "zbUXm3/BwEb+6jETaj+PAC5hgvr4iW/syLL1tatgSQA=": "MFkwEwYHKoZIzj0CAQYIKoZIzj0DAQcDQgAECyPLhWKYYUgEc+tUXfPQB4wtGS2MNvXrjwFCCnyYJifBtd2Sk7Cu+Js9DNhMTh35FftHaHu6ZrclnNBKwmbbSA==",
+}
+
 KNOWN_CERT_TYPES = {
     "2.23.140.1.1": "Extended validation TLS certificate",
     "2.23.140.1.2.1": "Domain validated TLS certificate",
     "2.23.140.1.2.2": "Organization validated TLS certificate",
 }
 
+AIA_CACHE_TTL = 3600
+AIA_FETCH_TIMEOUT = 10
+AIA_MAX_RESPONSE_SIZE = 1024 * 1024
+MAX_CHAIN_LENGTH = 10
+
+PROBE_PROTOCOLS = {
+    "TLSv1.0": SSL.TLS1_VERSION,
+    "TLSv1.1": SSL.TLS1_1_VERSION,
+    "TLSv1.2": SSL.TLS1_2_VERSION,
+    "TLSv1.3": SSL.TLS1_3_VERSION,
+}
+LEGACY_PROTOCOLS = ["TLSv1.0", "TLSv1.1"]
+PROBE_TIMEOUT = 5
+PROBE_POLL_INTERVAL = 0.1
+BATCH_TIMEOUT = 10
+
+# Probed with TLS 1.2 and below, as the TLS 1.3
+# suites are all AEAD with forward secrecy anyway.
+PROBE_CIPHER_GROUPS = {
+    "AEAD with forward secrecy": "ECDHE+AESGCM:ECDHE+CHACHA20:DHE+AESGCM:DHE+CHACHA20",
+    "CBC with forward secrecy": "ECDHE+SHA1:ECDHE+SHA256:ECDHE+SHA384:DHE+SHA1:DHE+SHA256",
+    "Static RSA key exchange": "kRSA",
+    "3DES": "3DES",
+    "RC4": "RC4",
+    "Anonymous": "aNULL",
+    "NULL encryption": "eNULL",
+}
+EXPIRY_STATUS_COLORS = {
+    "Expired!": "red",
+    "Expires soon!": "yellow",
+    "Valid": "green",
+}
+
+GOOD_CIPHER_GROUPS = ["AEAD with forward secrecy", "CBC with forward secrecy"]
+
+
+class HostConnectionError(Exception):
+    """
+    Raised when a host can't be reached. For a single host
+    we exit with the given code, while a batch just moves
+    on to the next one.
+    """
+
+    def __init__(self, message: str, exit_code: int) -> None:
+        super().__init__(message)
+        self.exit_code = exit_code
+
 
 @dataclass
 class Host:
@@ -376,9 +597,197 @@ class Host:
         return isinstance(self.host, (IPv4Address, IPv6Address))
 
 
+class IntermediateCache:
+    """
+    Caches certificates fetched via AIA, by URL and by
+    fingerprint, so that many leaves from the same CA
+    only trigger a single fetch. Failed fetches are
+    cached as well, so a dead URL is not retried for
+    every leaf.
+    """
+
+    def __init__(self, ttl: float = AIA_CACHE_TTL) -> None:
+        self.ttl = ttl
+        self.urls: dict[str, tuple[float, tuple[bytes, ...]]] = {}
+        self.certs: dict[bytes, Certificate] = {}
+
+    def get(self, url: str) -> list[Certificate] | None:
+        try:
+            expires, fingerprints = self.urls[url]
+        except KeyError:
+            return None
+
+        if expires < time.monotonic():
+            self.prune()
+            return None
+        return [self.certs[fingerprint] for fingerprint in fingerprints]
+
+    def add(self, url: str, certs: list[Certificate]) -> None:
+        self.prune()
+        fingerprints = []
+        for cert in certs:
+            fingerprint = cert.fingerprint(hashes.SHA256())
+            # Reuse the already known object, if any, so
+            # equal certs from different URLs are shared.
+            self.certs.setdefault(fingerprint, cert)
+            fingerprints.append(fingerprint)
+        self.urls[url] = (time.monotonic() + self.ttl, tuple(fingerprints))
+
+    def prune(self) -> None:
+        """
+        Drops the expired URLs, and the certs
+        no longer referenced by any URL.
+        """
+        now = time.monotonic()
+        self.urls = {url: entry for url, entry in self.urls.items() if entry[0] >= now}
+        referenced = {
+            fingerprint
+            for _, fingerprints in self.urls.values()
+            for fingerprint in fingerprints
+        }
+        self.certs = {
+            fingerprint: cert
+            for fingerprint, cert in self.certs.items()
+            if fingerprint in referenced
+        }
+
+
+AIA_CACHE = IntermediateCache()
+
+
+@dataclass
+class ChainDiff:
+    removed: list[Certificate]
+    added: list[Certificate]
+    # cert, old position, new position
+    reordered: list[tuple[Certificate, int, int]]
+    # old cert, new cert, field -> (old values, new values)
+    changed: list[
+        tuple[Certificate, Certificate, dict[str, tuple[list[str], list[str]]]]
+    ]
+
+
+class FleetReport:
+    """
+    Summary of a batch run, updated as the results come in.
+    The soonest expiring leaves are kept in a bounded heap,
+    and the rest is counters, so the memory use does not
+    grow with the number of hosts. The exception is the
+    list of hosts whose chain changed since the last run.
+    """
+
+    def __init__(self, top: int) -> None:
+        self.top = top
+        self.hosts = 0
+        self.failed = 0
+        # Max heap (by negated expiry) of the soonest expiring leaves,
+        # so the one expiring last is the one to throw out.
+        self.soonest: list[tuple[float, str, str, str]] = []
+        self.expiry_statuses: Counter[str] = Counter()
+        self.issuers: Counter[str] = Counter()
+        self.key_types: Counter[str] = Counter()
+        self.signature_algs: Counter[str] = Counter()
+        self.changed: list[str] = []
+
+    def add_failure(self) -> None:
+        self.hosts += 1
+        self.failed += 1
+
+    def add(self, host: str, certs: list[Certificate], previous_chain: str) -> None:
+        self.hosts += 1
+        leaf = certs[0]
+        not_after = get_not_after(leaf)
+
+        entry = (
+            -not_after.timestamp(),
+            host,
+            leaf.subject.rfc4514_string(),
+            not_after.isoformat(),
+        )
+        if len(self.soonest) < self.top:
+            heapq.heappush(self.soonest, entry)
+        else:
+            heapq.heappushpop(self.soonest, entry)
+
+        self.expiry_statuses[get_expiry_status(leaf)] += 1
+        self.issuers[leaf.issuer.rfc4514_string()] += 1
+        self.key_types[get_key_info(leaf.public_key())] += 1
+        self.signature_algs[get_hash_algorithm_name(leaf) or "Unknown"] += 1
+
+        if previous_chain != get_chain_fingerprint(certs):
+            self.changed.append(host)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "hosts": self.hosts,
+            "failed": self.failed,
+            "soonest_expiring": [
+                {"host": host, "subject": subject, "not_after": not_after}
+                for _, host, subject, not_after in sorted(self.soonest, reverse=True)
+            ],
+            "expiry_status": dict(self.expiry_statuses),
+            "changed": self.changed,
+            "issuers": dict(self.issuers.most_common()),
+            "key_types": dict(self.key_types.most_common()),
+            "signature_algs": dict(self.signature_algs.most_common()),
+        }
+
+    def write_csv(self, output: IO[str]) -> None:
+        report = self.to_dict()
+        writer = csv.writer(output)
+        writer.writerow(["section", "name", "value", "subject"])
+        writer.writerow(["hosts", "", report["hosts"], ""])
+        writer.writerow(["failed", "", report["failed"], ""])
+        for entry in report["soonest_expiring"]:
+            writer.writerow(
+                [
+                    "soonest_expiring",
+                    entry["host"],
+                    entry["not_after"],
+                    entry["subject"],
+                ]
+            )
+        for host in report["changed"]:
+            writer.writerow(["changed", host, "", ""])
+        for section in ("expiry_status", "issuers", "key_types", "signature_algs"):
+            for name, count in report[section].items():
+                writer.writerow([section, name, count, ""])
+
+    def print_text(self) -> None:
+        report = self.to_dict()
+        click.secho("#############################################################")
+        print_field("Hosts", [f"{report['hosts']} ({report['failed']} failed)"])
+        print_field(
+            "Soonest expiring",
+            [
+                f"{get_local_datetime(datetime.fromisoformat(entry['not_after']))} "
+                f"{entry['host']} ({entry['subject']})"
+                for entry in report["soonest_expiring"]
+            ],
+        )
+        print_field(
+            "Expiry status",
+            [
+                f"{count:>6}  {click.style(status, fg=EXPIRY_STATUS_COLORS[status])}"
+                for status, count in report["expiry_status"].items()
+            ],
+        )
+        print_field("Changed since last run", report["changed"])
+        for header, section in (
+            ("Issuers", "issuers"),
+            ("Key types", "key_types"),
+            ("Signature algs", "signature_algs"),
+        ):
+            print_field(
+                header,
+                [f"{count:>6}  {name}" for name, count in report[section].items()],
+            )
+        click.echo()
+
+
 @click.command(context_settings={"help_option_names": ["-h", "--help"]})
 @click.version_option(version=__version__)
-@click.argument("host")
+@click.argument("host", required=False)
 @click.option("--proxy", envvar="https_proxy", help="Proxy to use.")
 @click.option("--servername", help="Custom SNI name to send in handshake.")
 @click.option("--no-servername", is_flag=True, help="Do not send SNI in the handshake.")
@@ -387,15 +796,63 @@ class Host:
     "--first-only", is_flag=True, help="Only process the first retrieved cert."
 )
 @click.option("--openssl-format", is_flag=True, help="Print cert info like OpenSSL.")
+@click.option(
+    "--complete-chain",
+    is_flag=True,
+    help="Build the complete chain, using AIA if needed.",
+)
+@click.option(
+    "--enumerate",
+    "enumerate_",
+    is_flag=True,
+    help="Probe supported protocols and cipher groups.",
+)
+@click.option(
+    "--diff",
+    "diff_target",
+    metavar="TARGET",
+    help="Compare the chain with the one from another host, or a PEM file (file:PATH).",
+)
+@click.option(
+    "--batch",
+    type=click.File(),
+    help="Summarize the hosts in the file (one per line).",
+)
+@click.option(
+    "--report-format",
+    type=click.Choice(["text", "json", "csv"]),
+    default="text",
+    show_default=True,
+    help="Format of the batch summary.",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Number of soonest expiring certs in the batch summary.",
+)
+@click.option(
+    "--state",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="File to keep chains in between batch runs, to detect changes.",
+)
 def main(
-    host: str,
+    host: str | None,
     proxy: str | None,
     servername: str | None,
+    batch: IO[str] | None,
+    report_format: str,
+    top: int,
+    state: Path | None,
+    diff_target: str | None,
     *,
     no_servername: bool,
     print_pem: bool,
     first_only: bool,
     openssl_format: bool,
+    complete_chain: bool,
+    enumerate_: bool,
 ) -> None:
     """Peeks at certificates exposed by other hosts."""
     if servername and no_servername:
@@ -403,32 +860,166 @@ def main(
             "--servername and --no-servername are mutually exclusive."
         )
 
+    if enumerate_:
+        check_not_combined(
+            "--enumerate",
+            {
+                "--complete-chain": complete_chain,
+                "--print-pem": print_pem,
+                "--first-only": first_only,
+                "--openssl-format": openssl_format,
+            },
+        )
+
+    if diff_target is not None:
+        check_not_combined(
+            "--diff",
+            {
+                "--batch": batch is not None,
+                "--enumerate": enumerate_,
+                "--complete-chain": complete_chain,
+                "--print-pem": print_pem,
+                "--first-only": first_only,
+                "--openssl-format": openssl_format,
+            },
+        )
+
+    if batch is not None:
+        if host is not None:
+            raise click.BadArgumentUsage("HOST and --batch are mutually exclusive.")
+        check_not_combined(
+            "--batch",
+            {
+                "--enumerate": enumerate_,
+                "--print-pem": print_pem,
+                "--first-only": first_only,
+                "--openssl-format": openssl_format,
+            },
+        )
+        run_batch(
+            batch,
+            proxy,
+            servername,
+            no_servername=no_servername,
+            complete_chain=complete_chain,
+            top=top,
+            state=state,
+            report_format=report_format,
+        )
+        return
+
+    if host is None:
+        raise click.BadArgumentUsage("Missing argument 'HOST'.")
+
+    ctx = click.get_current_context()
+    for name in ("state", "top", "report_format"):
+        if ctx.get_parameter_source(name) != ParameterSource.DEFAULT:
+            option = "--" + name.replace("_", "-")
+            raise click.BadArgumentUsage(f"{option} can only be used with --batch.")
+
     parsed_host = parse_host_input(host)
+    sni = get_sni(parsed_host, servername, no_servername=no_servername)
+
+    if enumerate_:
+        print_enumeration(parsed_host, proxy, sni)
+        return
+
+    try:
+        certs, ocsp_responses, ssl_error = get_peer_certs(parsed_host, proxy, sni)
+        if not certs:
+            click.secho(
+                f"Could not retrieve a certificate chain from the specified host: {ssl_error}",
+                fg="red",
+                err=True,
+            )
+            sys.exit(1)
+
+        if diff_target is not None:
+            other_certs = get_diff_target_certs(
+                diff_target, proxy, servername, no_servername=no_servername
+            )
+    except HostConnectionError as error:
+        click.secho(str(error), fg="red", err=True)
+        sys.exit(error.exit_code)
+
+    if diff_target is not None:
+        print_chain_diff(certs, other_certs, str(parsed_host), diff_target)
+        return
+
+    if complete_chain:
+        served_certs = certs
+        certs = build_complete_chain(served_certs, proxy)
+        print_chain_summary(served_certs, certs)
+
+    ocsp_response = ocsp_responses[0] if ocsp_responses else None
+
+    last_cert = None
+    for cert in certs:
+        if openssl_format:
+            click.echo(
+                crypto.dump_certificate(
+                    crypto.FILETYPE_TEXT, crypto.X509.from_cryptography(cert)
+                ).decode()
+            )
+        else:
+            last_cert = print_cert_info(
+                cert,
+                servername or parsed_host.host,
+                last_cert,
+                issuer=find_issuer(cert, certs),
+                # The stapled response is for the leaf.
+                ocsp_response=ocsp_response if last_cert is None else None,
+            )
+        if print_pem:
+            click.echo(cert.public_bytes(Encoding.PEM).decode())
+
+        if first_only:
+            break
 
+
+def check_not_combined(option: str, others: dict[str, bool]) -> None:
+    for other, is_set in others.items():
+        if is_set:
+            raise click.BadArgumentUsage(
+                f"{option} and {other} are mutually exclusive."
+            )
+
+
+def get_peer_certs(
+    host: Host, proxy: str | None, sni: bytes | None, timeout: float | None = None
+) -> tuple[list[Certificate], list[bytes], SSL.Error | None]:
+    """
+    Raises HostConnectionError if the host can't be reached. The
+    timeout, if any, applies to the connect and the handshake.
+    """
     if proxy:
         click.secho(f"Connecting via '{proxy}'", err=True)
-        s = get_socket_via_proxy(proxy, parsed_host)
+        s = get_socket_via_proxy(proxy, host, timeout)
     else:
-        click.secho(f"Connecting directly to host '{parsed_host}'", err=True)
-        s = get_direct_socket(parsed_host)
+        click.secho(f"Connecting directly to host '{host}'", err=True)
+        s = get_direct_socket(host, timeout)
 
+    ocsp_responses: list[bytes] = []
     ctx = SSL.Context(SSL.SSLv23_METHOD)
+    ctx.set_ocsp_client_callback(store_ocsp_response, ocsp_responses)
     conn = SSL.Connection(ctx, s)
+    conn.request_ocsp()
 
-    if not no_servername:
-        if servername:
-            conn.set_tlsext_host_name(servername.encode())
-        else:
-            # IP addresses are not permitted in servername
-            # so only add if we are connecting to a DNS name.
-            if not parsed_host.is_ip:
-                conn.set_tlsext_host_name(str(parsed_host.host).encode())
+    if sni is not None:
+        conn.set_tlsext_host_name(sni)
 
     conn.set_connect_state()
     try:
-        conn.do_handshake()
+        if timeout is None:
+            conn.do_handshake()
+        else:
+            # A socket with a timeout is non-blocking underneath.
+            do_handshake(conn, s, time.monotonic() + timeout)
         conn.shutdown()
         conn.close()
+    except TimeoutError as error:
+        s.close()
+        raise HostConnectionError(f"Timed out handshaking with {host}", 4) from error
     except SSL.Error as error:
         # If the host requires a client certificate
         # the handshake will fail, but we will still
@@ -437,29 +1028,369 @@ def main(
     else:
         ssl_error = None
 
-    certs = conn.get_peer_cert_chain()
+    certs = [cert.to_cryptography() for cert in conn.get_peer_cert_chain() or []]
+    return certs, ocsp_responses, ssl_error
+
+
+def run_batch(
+    hosts: IO[str],
+    proxy: str | None,
+    servername: str | None,
+    *,
+    no_servername: bool,
+    complete_chain: bool,
+    top: int,
+    state: Path | None,
+    report_format: str,
+) -> None:
+    """
+    Connects to the hosts one by one, and feeds the
+    chains into the report as they come in, so nothing
+    is kept around per host (except for the changed ones).
+    The chains from earlier runs are looked up on disk.
+    """
+    report = FleetReport(top)
+
+    with closing(open_chain_state(state)) if state else nullcontext() as db:
+        for line in hosts:
+            host = line.strip()
+            if not host or host.startswith("#"):
+                continue
+
+            try:
+                parsed_host = parse_host_input(host)
+            except click.BadParameter as error:
+                click.secho(f"{error.message}: {host}", fg="red", err=True)
+                report.add_failure()
+                continue
+            except ValueError as error:
+                # E.g. an IDNAError for a name that can't be encoded.
+                click.secho(
+                    f"Invalid host specified: {host}: {error}", fg="red", err=True
+                )
+                report.add_failure()
+                continue
+
+            sni = get_sni(parsed_host, servername, no_servername=no_servername)
+            try:
+                certs, _, ssl_error = get_peer_certs(
+                    parsed_host, proxy, sni, BATCH_TIMEOUT
+                )
+            except HostConnectionError as error:
+                click.secho(str(error), fg="red", err=True)
+                report.add_failure()
+                continue
+
+            if not certs:
+                click.secho(
+                    f"Could not retrieve a certificate chain from {host}: {ssl_error}",
+                    fg="red",
+                    err=True,
+                )
+                report.add_failure()
+                continue
+
+            if complete_chain:
+                # Leaves from the same CA share the AIA cache.
+                certs = build_complete_chain(certs, proxy)
+
+            chain_fingerprint = get_chain_fingerprint(certs)
+            if db is None:
+                report.add(host, certs, chain_fingerprint)
+                continue
+
+            # Hosts that fail are not touched, so they
+            # keep their chain from the last good run.
+            previous = db.execute(
+                "SELECT fingerprint FROM chains WHERE host = ?", (host,)
+            ).fetchone()
+            report.add(host, certs, previous[0] if previous else chain_fingerprint)
+            db.execute(
+                "INSERT OR REPLACE INTO chains VALUES (?, ?)", (host, chain_fingerprint)
+            )
+
+        if db is not None:
+            db.commit()
+
+    if report_format == "json":
+        click.echo(json.dumps(report.to_dict(), indent=2))
+    elif report_format == "csv":
+        report.write_csv(sys.stdout)
+    else:
+        report.print_text()
+
+
+def get_diff_target_certs(
+    target: str, proxy: str | None, servername: str | None, *, no_servername: bool
+) -> list[Certificate]:
+    """
+    The target is either a PEM file prefixed with "file:" (e.g.
+    the output of --print-pem from an earlier run), or another
+    host. The prefix is required, so a host is never mistaken
+    for a file that happens to have the same name.
+    """
+    if target.startswith("file:"):
+        path = Path(target.removeprefix("file:"))
+        try:
+            return load_pem_x509_certificates(path.read_bytes())
+        except OSError as error:
+            raise click.BadParameter(f"Unable to read {path}: {error}") from error
+        except ValueError as ve:
+            raise click.BadParameter(f"No certificates found in {path}") from ve
+
+    parsed_host = parse_host_input(target)
+    sni = get_sni(parsed_host, servername, no_servername=no_servername)
+    certs, _, ssl_error = get_peer_certs(parsed_host, proxy, sni)
     if not certs:
         click.secho(
-            f"Could not retrieve a certificate chain from the specified host: {ssl_error}",
+            f"Could not retrieve a certificate chain from {target}: {ssl_error}",
             fg="red",
             err=True,
         )
         sys.exit(1)
+    return certs
 
-    last_cert = None
+
+def open_chain_state(path: Path) -> sqlite3.Connection:
+    db = sqlite3.connect(path)
+    try:
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS chains "
+            "(host TEXT PRIMARY KEY, fingerprint TEXT NOT NULL)"
+        )
+    except sqlite3.DatabaseError as error:
+        db.close()
+        raise click.BadParameter(f"Invalid state file {path}: {error}") from error
+    return db
+
+
+def get_chain_fingerprint(certs: list[Certificate]) -> str:
+    sha256 = hashes.Hash(hashes.SHA256())
     for cert in certs:
-        if openssl_format:
-            click.echo(crypto.dump_certificate(crypto.FILETYPE_TEXT, cert).decode())
+        sha256.update(cert.fingerprint(hashes.SHA256()))
+    return sha256.finalize().hex()
+
+
+def get_sni(host: Host, servername: str | None, *, no_servername: bool) -> bytes | None:
+    if no_servername:
+        return None
+    if servername:
+        return servername.encode()
+    # IP addresses are not permitted in servername
+    # so only add if we are connecting to a DNS name.
+    if host.is_ip:
+        return None
+    return str(host.host).encode()
+
+
+@cache
+def get_probe_context(
+    min_version: int, max_version: int, ciphers: str
+) -> SSL.Context | None:
+    """
+    Returns a context that only allows the specified
+    versions and ciphers, or None if the local OpenSSL
+    doesn't support them. They are built once and then
+    shared by all probes.
+    """
+    ctx = SSL.Context(SSL.TLS_METHOD)
+    try:
+        ctx.set_min_proto_version(min_version)
+        ctx.set_max_proto_version(max_version)
+        # Legacy stuff is disabled by the default security level.
+        ctx.set_cipher_list(f"{ciphers}:@SECLEVEL=0".encode())
+    except SSL.Error:
+        return None
+    return ctx
+
+
+def get_probe_socket(host: Host, proxy: str | None, deadline: float) -> socket.socket:
+    """
+    Like get_direct_socket and get_socket_via_proxy, but raises
+    OSError instead of exiting, as one failed probe shouldn't
+    stop the others. The socket is left non-blocking.
+    """
+    if proxy:
+        s = socket.create_connection(
+            parse_proxy(proxy), timeout=deadline - time.monotonic()
+        )
+        try:
+            s.send(f"CONNECT {host} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            # A timeout of zero makes it non-blocking, so
+            # recv fails right away if the deadline passed.
+            s.settimeout(max(deadline - time.monotonic(), 0))
+            proxy_response = s.recv(1024).decode(errors="replace")
+        except OSError:
+            s.close()
+            raise
+        if proxy_response.split("\r\n")[0].split(" ")[1:2] != ["200"]:
+            s.close()
+            raise OSError(f"Proxy refused the connection: {proxy_response}")
+    else:
+        s = socket.create_connection(
+            (str(host.host), host.port), timeout=deadline - time.monotonic()
+        )
+    s.settimeout(0)  # non-blocking
+    return s
+
+
+def do_handshake(
+    conn: SSL.Connection,
+    s: socket.socket,
+    deadline: float,
+    cancelled: threading.Event | None = None,
+) -> None:
+    """
+    Handshakes over a non-blocking socket, and raises
+    TimeoutError at the deadline or when cancelled.
+    """
+    while True:
+        try:
+            conn.do_handshake()
+        except SSL.WantReadError:
+            readable, writable = [s], []
+        except SSL.WantWriteError:
+            readable, writable = [], [s]
         else:
-            last_cert = print_cert_info(
-                cert.to_cryptography(), servername or parsed_host.host, last_cert
-            )
-        if print_pem:
-            pem_cert = crypto.dump_certificate(crypto.FILETYPE_PEM, cert)
-            click.echo(pem_cert.decode())
+            return
 
-        if first_only:
-            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or (cancelled is not None and cancelled.is_set()):
+            raise TimeoutError
+        # Wake up now and then to see if we are cancelled.
+        select.select(readable, writable, [], min(remaining, PROBE_POLL_INTERVAL))
+
+
+def probe(
+    host: Host,
+    proxy: str | None,
+    sni: bytes | None,
+    ctx: SSL.Context,
+    cancelled: threading.Event,
+) -> str:
+    """
+    Returns "yes" if the host accepted the handshake, "no" if
+    it didn't, and "error" if the connection to it failed.
+    Connecting and handshaking share one PROBE_TIMEOUT.
+    """
+    deadline = time.monotonic() + PROBE_TIMEOUT
+    try:
+        s = get_probe_socket(host, proxy, deadline)
+    except OSError:
+        return "error"
+
+    conn = SSL.Connection(ctx, s)
+    if sni is not None:
+        conn.set_tlsext_host_name(sni)
+    conn.set_connect_state()
+    try:
+        do_handshake(conn, s, deadline, cancelled)
+    except TimeoutError:
+        # Some servers (and middleboxes) silently
+        # drop a hello they don't like.
+        return "no"
+    except SSL.Error:
+        # If the host requires a client certificate the
+        # handshake fails after the parameters are agreed.
+        return "yes" if conn.get_cipher_name() is not None else "no"
+    except OSError:
+        return "no"
+    else:
+        return "yes"
+    finally:
+        s.close()
+
+
+def enumerate_host(
+    host: Host, proxy: str | None, sni: bytes | None
+) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Probes all protocols and cipher groups in parallel,
+    so it takes about as long as a single handshake.
+    "n/a" means it could not be probed with the local OpenSSL.
+    """
+    probes = {}
+    for name, version in PROBE_PROTOCOLS.items():
+        probes[("protocol", name)] = get_probe_context(version, version, "ALL")
+    for name, ciphers in PROBE_CIPHER_GROUPS.items():
+        probes[("ciphers", name)] = get_probe_context(
+            SSL.TLS1_VERSION, SSL.TLS1_2_VERSION, ciphers
+        )
+
+    results: dict[tuple[str, str], str] = {
+        key: "n/a" for key, ctx in probes.items() if ctx is None
+    }
+    protocol_keys = [("protocol", name) for name in PROBE_PROTOCOLS]
+
+    cancelled = threading.Event()
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        futures = {
+            executor.submit(probe, host, proxy, sni, ctx, cancelled): key
+            for key, ctx in probes.items()
+            if ctx is not None
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            # A host that only speaks TLS 1.3 won't accept any of
+            # the cipher groups, so cut the probes still waiting for
+            # a reply. They notice within PROBE_POLL_INTERVAL.
+            if all(key in results for key in protocol_keys) and all(
+                results[key] == "no"
+                for key in protocol_keys[:-1]  # all but TLS 1.3
+            ):
+                cancelled.set()
+                break
+
+    protocols = {name: results[("protocol", name)] for name in PROBE_PROTOCOLS}
+    cipher_groups = {
+        name: results.get(("ciphers", name), "no") for name in PROBE_CIPHER_GROUPS
+    }
+    return protocols, cipher_groups
+
+
+def format_probe_result(name: str, *, result: str, good: bool) -> str:
+    if result == "yes":
+        text = click.style(result, fg="green" if good else "red")
+    elif result == "error":
+        text = click.style(result, fg="yellow")
+    else:
+        text = result
+    return f"{name:<26} {text}"
+
+
+def print_enumeration(host: Host, proxy: str | None, sni: bytes | None) -> None:
+    if proxy:
+        # Validate it up front, and not in every probe.
+        parse_proxy(proxy)
+    click.secho(f"Probing '{host}'", err=True)
+    protocols, cipher_groups = enumerate_host(host, proxy, sni)
+
+    click.secho("#############################################################")
+    print_field(
+        "Protocols",
+        [
+            format_probe_result(name, result=result, good=name not in LEGACY_PROTOCOLS)
+            for name, result in protocols.items()
+        ],
+    )
+    print_field(
+        "Cipher groups (TLSv1.2 and below)",
+        [
+            format_probe_result(name, result=result, good=name in GOOD_CIPHER_GROUPS)
+            for name, result in cipher_groups.items()
+        ],
+    )
+    click.echo()
+
+
+def store_ocsp_response(
+    conn: SSL.Connection, ocsp_data: bytes, responses: list[bytes] | None
+) -> bool:
+    # We only want to look at the response, not
+    # fail the handshake, so always return True.
+    if ocsp_data and responses is not None:
+        responses.append(ocsp_data)
+    return True
 
 
 def parse_host_input(input: str) -> Host:
@@ -505,7 +1436,7 @@ def parse_host_input(input: str) -> Host:
     return Host(idna.encode(parsed_host.hostname).decode(), port)
 
 
-def get_socket_via_proxy(proxy: str, host: Host) -> socket.socket:
+def parse_proxy(proxy: str) -> tuple[str, int]:
     proxy_addr = urlsplit(proxy)
     if proxy_addr.scheme != "http":
         raise click.BadParameter("Only http proxies are supported")
@@ -518,36 +1449,195 @@ def get_socket_via_proxy(proxy: str, host: Host) -> socket.socket:
 
     if proxy_host is None:
         raise click.BadParameter("Invalid proxy specified")
+    return proxy_host, proxy_port
 
+
+def get_socket_via_proxy(
+    proxy: str, host: Host, timeout: float | None = None
+) -> socket.socket:
+    proxy_host, proxy_port = parse_proxy(proxy)
     try:
-        s = socket.create_connection((proxy_host, proxy_port))
+        s = socket.create_connection((proxy_host, proxy_port), timeout=timeout)
     except OSError as error:
-        click.secho(f"Unable to connect to proxy {proxy}: {error}", fg="red", err=True)
-        sys.exit(2)
+        raise HostConnectionError(
+            f"Unable to connect to proxy {proxy}: {error}", 2
+        ) from error
 
-    s.send(f"CONNECT {host} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
     try:
+        s.send(f"CONNECT {host} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
         proxy_response = s.recv(1024).decode()
         status_code = proxy_response.split("\r\n")[0].split(" ")[1]
-    except (UnicodeDecodeError, IndexError):
-        click.secho(f"Recieved invalid response from proxy {proxy}", fg="red", err=True)
-        sys.exit(5)
+    except OSError as error:
+        s.close()
+        raise HostConnectionError(
+            f"Unable to connect to proxy {proxy}: {error}", 2
+        ) from error
+    except (UnicodeDecodeError, IndexError) as error:
+        s.close()
+        raise HostConnectionError(
+            f"Recieved invalid response from proxy {proxy}", 5
+        ) from error
 
     if status_code != "200":
-        click.secho(f"Computer says no:\n{proxy_response}", fg="red", err=True)
-        sys.exit(3)
+        s.close()
+        raise HostConnectionError(f"Computer says no:\n{proxy_response}", 3)
     return s
 
 
-def get_direct_socket(host: Host) -> socket.socket:
+def get_direct_socket(host: Host, timeout: float | None = None) -> socket.socket:
     try:
-        s = socket.create_connection((str(host.host), host.port))
+        s = socket.create_connection((str(host.host), host.port), timeout=timeout)
     except OSError as error:
-        click.secho(f"Unable to connect to {host}: {error}", fg="red", err=True)
-        sys.exit(4)
+        raise HostConnectionError(f"Unable to connect to {host}: {error}", 4) from error
     return s
 
 
+def get_aia_issuer_urls(cert: Certificate) -> list[str]:
+    try:
+        aia = cert.extensions.get_extension_for_class(AuthorityInformationAccess)
+    except ExtensionNotFound:
+        return []
+
+    return [
+        desc.access_location.value
+        for desc in aia.value
+        if desc.access_method == AuthorityInformationAccessOID.CA_ISSUERS
+        and isinstance(desc.access_location, UniformResourceIdentifier)
+    ]
+
+
+def load_aia_certs(data: bytes) -> list[Certificate]:
+    """
+    caIssuers URLs should point to either a single
+    DER encoded cert or a DER encoded "certs-only"
+    PKCS#7 bundle, but PEM is seen in the wild as well.
+    """
+    try:
+        return [load_der_x509_certificate(data)]
+    except ValueError:
+        pass
+
+    try:
+        return load_der_pkcs7_certificates(data)
+    except ValueError:
+        pass
+
+    try:
+        return load_pem_x509_certificates(data)
+    except ValueError:
+        return []
+
+
+def fetch_aia_certs(url: str, proxy: str | None) -> list[Certificate]:
+    opener = urllib.request.build_opener(
+        urllib.request.ProxyHandler({"http": proxy} if proxy else {})
+    )
+    # The URL comes from the cert, so anything can go wrong here.
+    try:
+        # RFC 5280 says caIssuers must be served over plain http
+        # (and we don't want to follow ldap:// and friends).
+        if urlsplit(url).scheme != "http":
+            return []
+
+        with opener.open(url, timeout=AIA_FETCH_TIMEOUT) as resp:
+            data = resp.read(AIA_MAX_RESPONSE_SIZE)
+    except (OSError, http.client.HTTPException, ValueError) as error:
+        click.secho(f"Unable to fetch {url}: {error}", fg="yellow", err=True)
+        return []
+
+    certs = load_aia_certs(data)
+    if not certs:
+        click.secho(f"Recieved invalid response from {url}", fg="yellow", err=True)
+    return certs
+
+
+def is_issuer(cert: Certificate, issuer: Certificate) -> bool:
+    if cert.issuer != issuer.subject:
+        return False
+    try:
+        cert.verify_directly_issued_by(issuer)
+    except (ValueError, TypeError, InvalidSignature):
+        return False
+    return True
+
+
+def find_issuer(cert: Certificate, certs: list[Certificate]) -> Certificate | None:
+    return next((c for c in certs if c != cert and is_issuer(cert, c)), None)
+
+
+def fetch_issuer(
+    cert: Certificate, proxy: str | None, cache: IntermediateCache
+) -> Certificate | None:
+    for url in get_aia_issuer_urls(cert):
+        candidates = cache.get(url)
+        if candidates is None:
+            candidates = fetch_aia_certs(url, proxy)
+            cache.add(url, candidates)
+
+        for candidate in candidates:
+            if is_issuer(cert, candidate):
+                return candidate
+    return None
+
+
+def build_complete_chain(
+    served_certs: list[Certificate],
+    proxy: str | None,
+    cache: IntermediateCache = AIA_CACHE,
+) -> list[Certificate]:
+    """
+    Builds the chain from the leaf (the first served cert)
+    and upwards, using the served certs in whatever order
+    they came, and fetching missing issuers via AIA.
+    Duplicates and certs not part of the chain are dropped.
+    """
+    pool = list(
+        {cert.fingerprint(hashes.SHA256()): cert for cert in served_certs}.values()
+    )
+    chain = [pool.pop(0)]
+
+    while len(chain) < MAX_CHAIN_LENGTH:
+        cert = chain[-1]
+        if cert.issuer == cert.subject:
+            break
+
+        issuer = find_issuer(cert, pool)
+        if issuer is not None:
+            pool.remove(issuer)
+        else:
+            issuer = fetch_issuer(cert, proxy, cache)
+            if issuer is None or issuer in chain:
+                break
+        chain.append(issuer)
+
+    return chain
+
+
+def print_chain_summary(
+    served_certs: list[Certificate], complete_chain: list[Certificate]
+) -> None:
+    click.secho("#############################################################")
+    print_field(
+        "Served chain",
+        [
+            f"{i}: {cert.subject.rfc4514_string()}"
+            for i, cert in enumerate(served_certs)
+        ],
+    )
+
+    complete = []
+    for i, cert in enumerate(complete_chain):
+        line = f"{i}: {cert.subject.rfc4514_string()}"
+        if cert not in served_certs:
+            line += click.style(" (fetched via AIA)", fg="yellow")
+        complete.append(line)
+    print_field("Complete chain", complete)
+
+    if complete_chain[-1].issuer != complete_chain[-1].subject:
+        click.secho("Could not build the chain up to a root", fg="red")
+    click.echo()
+
+
 def print_field(header: str, values: Iterable[str | int | None]) -> None:
     if values and any(values):
         click.secho(f"[{header}]")
@@ -562,6 +1652,122 @@ def get_log_names(scts: list[SignedCertificateTimestamp]) -> list[str]:
     return names
 
 
+@cache
+def get_log_key(log_id: str) -> Any:
+    try:
+        return load_der_public_key(b64decode(KNOWN_LOG_KEYS[log_id]))
+    except (KeyError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=1024)
+def get_precert_entry(cert: Certificate, issuer: Certificate) -> bytes:
+    """
+    Reconstructs the PreCert part of the data signed by
+    the log (RFC 6962 section 3.2): the hash of the issuer
+    key and the TBS without the SCT list extension.
+    """
+    tbs = cert.tbs_precertificate_bytes
+    return get_spki_hash(issuer) + len(tbs).to_bytes(3, "big") + tbs
+
+
+def get_spki_hash(cert: Certificate) -> bytes:
+    sha256 = hashes.Hash(hashes.SHA256())
+    sha256.update(
+        cert.public_key().public_bytes(Encoding.DER, PublicFormat.SubjectPublicKeyInfo)
+    )
+    return sha256.finalize()
+
+
+def verify_sct(
+    sct: SignedCertificateTimestamp, cert: Certificate, issuer: Certificate | None
+) -> bool | None:
+    """
+    Verifies an embedded SCT against the key of the log.
+    Returns None if it can't be checked, e.g. the log
+    is unknown or the issuer is not in the chain.
+    """
+    if issuer is None or sct.entry_type != LogEntryType.PRE_CERTIFICATE:
+        return None
+
+    key = get_log_key(b64encode(sct.log_id).decode())
+    if key is None:
+        return None
+
+    timestamp = sct.timestamp.replace(tzinfo=timezone.utc)
+    signed_data = (
+        struct.pack(
+            ">BBQH",
+            sct.version.value,
+            0,  # signature_type: certificate_timestamp
+            (timestamp - datetime.fromtimestamp(0, tz=timezone.utc))
+            // timedelta(milliseconds=1),
+            sct.entry_type.value,
+        )
+        + get_precert_entry(cert, issuer)
+        + struct.pack(">H", len(sct.extension_bytes))
+        + sct.extension_bytes
+    )
+
+    return verify_signature(
+        key, sct.signature, signed_data, sct.signature_hash_algorithm
+    )
+
+
+def verify_signature(
+    key: Any, signature: bytes, data: bytes, hash_algorithm: Any
+) -> bool | None:
+    """
+    Verifies a signature made with an RSA (PKCS#1 v1.5), EC
+    or EdDSA key. Returns None for keys of other types.
+    """
+    try:
+        if isinstance(key, EllipticCurvePublicKey):
+            key.verify(signature, data, ECDSA(hash_algorithm))
+        elif isinstance(key, RSAPublicKey):
+            key.verify(signature, data, PKCS1v15(), hash_algorithm)
+        elif isinstance(key, (Ed25519PublicKey, Ed448PublicKey)):
+            key.verify(signature, data)
+        else:
+            return None
+    except InvalidSignature:
+        return False
+    return True
+
+
+def get_sct_info(
+    scts: list[SignedCertificateTimestamp],
+    cert: Certificate,
+    issuer: Certificate | None,
+) -> list[str]:
+    info = []
+    for name, sct in zip(get_log_names(scts), scts, strict=True):
+        valid = verify_sct(sct, cert, issuer)
+        if valid is True:
+            info.append(name + click.style(" (valid signature)", fg="green"))
+        elif valid is False:
+            info.append(name + click.style(" (invalid signature!)", fg="red"))
+        else:
+            reason = get_sct_not_verified_reason(sct, issuer)
+            info.append(name + click.style(f" (not verified: {reason})", fg="yellow"))
+    return info
+
+
+def get_sct_not_verified_reason(
+    sct: SignedCertificateTimestamp, issuer: Certificate | None
+) -> str:
+    """
+    Why verify_sct returned None for the SCT.
+    """
+    if issuer is None:
+        return "issuer not in chain"
+    if sct.entry_type != LogEntryType.PRE_CERTIFICATE:
+        return "not a precert SCT"
+    if get_log_key(b64encode(sct.log_id).decode()) is None:
+        return "no log key"
+    return "unsupported log key type"
+
+
 def get_key_info(key: Any) -> str:
     if isinstance(key, RSAPublicKey):
         return f"RSA ({key.key_size})"
@@ -584,6 +1790,64 @@ def get_type(policies: list[PolicyInformation], *, is_ca: bool) -> str | None:
     return None
 
 
+@lru_cache(maxsize=1024)
+def load_ocsp_response(data: bytes) -> OCSPResponse | None:
+    try:
+        return load_der_ocsp_response(data)
+    except ValueError:
+        return None
+
+
+def get_ocsp_this_update(response: "OCSPResponse | OCSPSingleResponse") -> datetime:
+    try:
+        # cryptography >= 43
+        return response.this_update_utc
+    except AttributeError:
+        # cryptography < 43
+        return response.this_update.replace(tzinfo=timezone.utc)
+
+
+def get_ocsp_next_update(
+    response: "OCSPResponse | OCSPSingleResponse",
+) -> datetime | None:
+    try:
+        # cryptography >= 43
+        return response.next_update_utc
+    except AttributeError:
+        # cryptography < 43
+        if response.next_update is None:
+            return None
+        return response.next_update.replace(tzinfo=timezone.utc)
+
+
+def get_ocsp_signer(response: OCSPResponse, issuer: Certificate) -> Certificate | None:
+    """
+    Returns the cert that signed the response: either
+    the issuer itself, or a delegated responder cert
+    issued by the issuer for OCSP signing.
+    """
+    for cert in [issuer, *response.certificates]:
+        if response.responder_name is not None:
+            if cert.subject != response.responder_name:
+                continue
+        elif (
+            response.responder_key_hash
+            != SubjectKeyIdentifier.from_public_key(cert.public_key()).digest
+        ):
+            continue
+
+        if cert == issuer:
+            return cert
+
+        try:
+            ekus = cert.extensions.get_extension_for_class(ExtendedKeyUsage).value
+        except ExtensionNotFound:
+            continue
+        if ExtendedKeyUsageOID.OCSP_SIGNING in ekus and is_issuer(cert, issuer):
+            return cert
+    return None
+
+
 def get_local_datetime(dt: datetime) -> str:
     """
     Takes a timezone aware datetime, and returns
@@ -610,7 +1874,7 @@ def get_not_after(cert: Certificate) -> datetime:
         return cert.not_valid_after.replace(tzinfo=timezone.utc)
 
 
-def get_not_after_status(cert: Certificate) -> str:
+def get_expiry_status(cert: Certificate) -> str:
     not_after = get_not_after(cert)
     not_before = get_not_before(cert)
     lifetime = not_after - not_before
@@ -624,13 +1888,16 @@ def get_not_after_status(cert: Certificate) -> str:
 
     delta = (not_after - datetime.now(tz=timezone.utc)).total_seconds()
     if delta < 0:
-        text = click.style("Expired!", fg="red")
-    elif delta < warning_limit:
-        text = click.style("Expires soon!", fg="yellow")
-    else:
-        text = click.style("Valid", fg="green")
+        return "Expired!"
+    if delta < warning_limit:
+        return "Expires soon!"
+    return "Valid"
 
-    return f"{get_local_datetime(not_after)} ({text})"
+
+def get_not_after_status(cert: Certificate) -> str:
+    status = get_expiry_status(cert)
+    text = click.style(status, fg=EXPIRY_STATUS_COLORS[status])
+    return f"{get_local_datetime(get_not_after(cert))} ({text})"
 
 
 def get_hash_algorithm_name(cert: Certificate) -> str | None:
@@ -638,28 +1905,139 @@ def get_hash_algorithm_name(cert: Certificate) -> str | None:
 
 
 def name_matches_destination(
-    name: GeneralName, destination: str | IPv4Address | IPv6Address
+    name: str, destination: str | IPv4Address | IPv6Address
 ) -> bool:
-    if name.value == destination:
+    if name == str(destination):
         return True
 
-    if isinstance(name.value, str) and isinstance(destination, str):
+    if isinstance(destination, str):
         # Working with domain names, not IPs - check for wildcard.
         return (
-            name.value.startswith("*.")
+            name.startswith("*.")
             and destination.count(".") > 1  # can't have *.no
-            and name.value.split(".", maxsplit=1)[1]
-            == destination.split(".", maxsplit=1)[1]
+            and name.split(".", maxsplit=1)[1] == destination.split(".", maxsplit=1)[1]
         )
 
     return False
 
 
-def print_cert_info(
-    cert: Certificate,
-    destination: str | IPv4Address | IPv6Address,
-    last_cert: Certificate | None,
-) -> Certificate:
+def get_ocsp_single_response(
+    response: OCSPResponse, cert: Certificate, issuer: Certificate | None
+) -> "OCSPResponse | OCSPSingleResponse | None":
+    """
+    A response can hold the status of several certs (RFC 6960),
+    so find the one for this cert: by the serial, the hash of the
+    issuer name, and the hash of the issuer key (if we have it).
+    """
+    try:
+        # cryptography >= 43
+        single_responses = list(response.responses)
+    except AttributeError:
+        # cryptography < 43, which only handles a single one
+        single_responses = [response]
+
+    for single in single_responses:
+        if single.serial_number != cert.serial_number:
+            continue
+        try:
+            name_hash = hashes.Hash(single.hash_algorithm)
+            name_hash.update(cert.issuer.public_bytes())
+            if single.issuer_name_hash != name_hash.finalize():
+                continue
+            if issuer is None:
+                return single
+            cert_id = (
+                OCSPRequestBuilder()
+                .add_certificate(cert, issuer, single.hash_algorithm)
+                .build()
+            )
+        except (UnsupportedAlgorithm, ValueError):
+            continue
+        if single.issuer_key_hash == cert_id.issuer_key_hash:
+            return single
+    return None
+
+
+def get_ocsp_status(response: "OCSPResponse | OCSPSingleResponse") -> str:
+    if response.certificate_status == OCSPCertStatus.GOOD:
+        return click.style("Good", fg="green")
+    if response.certificate_status == OCSPCertStatus.REVOKED:
+        revoked = click.style("Revoked!", fg="red")
+        return f"{revoked} ({response.revocation_reason or 'no reason given'})"
+    return click.style("Unknown", fg="yellow")
+
+
+def print_ocsp_info(data: bytes, cert: Certificate, issuer: Certificate | None) -> None:
+    response = load_ocsp_response(data)
+    if response is None:
+        click.secho("Invalid stapled OCSP response", fg="red")
+        return
+
+    if response.response_status != OCSPResponseStatus.SUCCESSFUL:
+        print_field("Stapled OCSP", [response.response_status.name])
+        return
+
+    single = get_ocsp_single_response(response, cert, issuer)
+    if single is None:
+        print_field(
+            "Stapled OCSP", [click.style("Response is for another cert!", fg="red")]
+        )
+        print_field("OCSP signature", [get_ocsp_signature_status(response, issuer)])
+        return
+
+    next_update = get_ocsp_next_update(single)
+    print_field("Stapled OCSP", [get_ocsp_status(single)])
+    print_field("OCSP this update", [get_local_datetime(get_ocsp_this_update(single))])
+    if next_update is not None:
+        if next_update < datetime.now(tz=timezone.utc):
+            expired = click.style("Expired!", fg="red")
+            print_field(
+                "OCSP next update", [f"{get_local_datetime(next_update)} ({expired})"]
+            )
+        else:
+            print_field("OCSP next update", [get_local_datetime(next_update)])
+
+    print_field("OCSP signature", [get_ocsp_signature_status(response, issuer)])
+
+
+def get_ocsp_signature_status(
+    response: OCSPResponse, issuer: Certificate | None
+) -> str:
+    if issuer is None:
+        return click.style("Unable to verify, issuer not in chain", fg="yellow")
+
+    signer = get_ocsp_signer(response, issuer)
+    if signer is None:
+        return click.style("Not signed by the issuer!", fg="red")
+
+    if response.signature_algorithm_oid == SignatureAlgorithmOID.RSASSA_PSS:
+        # cryptography doesn't expose the PSS parameters for OCSP responses
+        valid = None
+    else:
+        valid = verify_signature(
+            signer.public_key(),
+            response.signature,
+            response.tbs_response_bytes,
+            response.signature_hash_algorithm,
+        )
+
+    if valid is None:
+        return click.style("Unable to verify, unsupported algorithm", fg="yellow")
+    if not valid:
+        return click.style("Not signed by the issuer!", fg="red")
+    if signer == issuer:
+        return click.style("Signed by the issuer", fg="green")
+    return click.style(
+        f"Signed by delegated responder {signer.subject.rfc4514_string()}", fg="green"
+    )
+
+
+def get_cert_fields(cert: Certificate) -> dict[str, list[str]]:
+    """
+    The fields shown by print_cert_info, as plain text
+    (without colours, and anything that depends on the
+    rest of the chain or the current time).
+    """
     sans: list[str] = []
     scts: list[SignedCertificateTimestamp] = []
     policies: list[PolicyInformation] = []
@@ -668,11 +2046,7 @@ def print_cert_info(
 
     for ext in cert.extensions:
         if ext.oid.dotted_string == "2.5.29.17":
-            for name in ext.value:
-                if last_cert is None and name_matches_destination(name, destination):
-                    sans.append(click.style(str(name.value), fg="green"))
-                else:
-                    sans.append(str(name.value))
+            sans = [str(name.value) for name in ext.value]
         elif ext.oid.dotted_string == "1.3.6.1.4.1.11129.2.4.2":
             scts.extend(ext.value)
         elif ext.oid.dotted_string == "2.5.29.32":
@@ -682,21 +2056,186 @@ def print_cert_info(
         elif isinstance(ext.value, BasicConstraints):
             is_ca = ext.value.ca
 
+    cert_type = get_type(policies, is_ca=is_ca)
+    hash_algorithm_name = get_hash_algorithm_name(cert)
+    return {
+        "Subject": [cert.subject.rfc4514_string()],
+        "Issuer": [cert.issuer.rfc4514_string()],
+        "Serial": [str(cert.serial_number)],
+        "Key type": [get_key_info(cert.public_key())],
+        "Not before": [get_local_datetime(get_not_before(cert))],
+        "Not after": [get_local_datetime(get_not_after(cert))],
+        "SANs": sans,
+        "SCTs": get_log_names(scts),
+        "Type": [cert_type] if cert_type else [],
+        "Extended Key Usages": ekus,
+        "Signature alg": [hash_algorithm_name] if hash_algorithm_name else [],
+        "SHA1": [cert.fingerprint(hashes.SHA1()).hex()],  # noqa:S303
+        "SHA256": [cert.fingerprint(hashes.SHA256()).hex()],
+    }
+
+
+def diff_cert_fields(
+    old: Certificate, new: Certificate
+) -> dict[str, tuple[list[str], list[str]]]:
+    old_fields = get_cert_fields(old)
+    new_fields = get_cert_fields(new)
+    return {
+        field: (old_values, new_fields[field])
+        for field, old_values in old_fields.items()
+        # The fingerprints always differ between two certs.
+        if field not in ("SHA1", "SHA256") and old_values != new_fields[field]
+    }
+
+
+def diff_chains(old: list[Certificate], new: list[Certificate]) -> ChainDiff | None:
+    """
+    Matches the certs by fingerprint, and then by key or
+    subject (so a renewed cert shows up as changed, not
+    removed and added). Returns None if the chains are
+    identical.
+    """
+    if get_chain_fingerprint(old) == get_chain_fingerprint(new):
+        return None
+
+    old_fingerprints = [cert.fingerprint(hashes.SHA256()) for cert in old]
+    new_fingerprints = [cert.fingerprint(hashes.SHA256()) for cert in new]
+
+    kept = [fp for fp in old_fingerprints if fp in new_fingerprints]
+    new_positions = [new_fingerprints.index(fp) for fp in kept]
+    # The certs still in the same order relative to each
+    # other stayed put, so only the rest count as moved.
+    in_order = get_longest_increasing_subsequence(new_positions)
+    reordered = [
+        (old[old_fingerprints.index(fp)], old_fingerprints.index(fp), new_positions[i])
+        for i, fp in enumerate(kept)
+        if i not in in_order
+    ]
+
+    removed = [
+        cert for cert, fp in zip(old, old_fingerprints, strict=True) if fp not in kept
+    ]
+    added = [
+        cert for cert, fp in zip(new, new_fingerprints, strict=True) if fp not in kept
+    ]
+
+    changed = []
+    for old_cert in list(removed):
+        spki_hash = get_spki_hash(old_cert)
+        new_cert = next((c for c in added if get_spki_hash(c) == spki_hash), None)
+        if new_cert is None:
+            # A cert renewed with a new key is still the
+            # replacement, and the interesting thing to compare.
+            new_cert = next((c for c in added if c.subject == old_cert.subject), None)
+        if new_cert is not None:
+            removed.remove(old_cert)
+            added.remove(new_cert)
+            changed.append((old_cert, new_cert, diff_cert_fields(old_cert, new_cert)))
+
+    return ChainDiff(removed, added, reordered, changed)
+
+
+def get_longest_increasing_subsequence(values: list[int]) -> set[int]:
+    """
+    Returns the indexes of a longest increasing subsequence
+    of the values. Quadratic, but chains are short.
+    """
+    # The length of, and the index before, the
+    # longest such subsequence ending at each index.
+    lengths = [1] * len(values)
+    previous: list[int | None] = [None] * len(values)
+    for i, value in enumerate(values):
+        for j in range(i):
+            if values[j] < value and lengths[j] + 1 > lengths[i]:
+                lengths[i] = lengths[j] + 1
+                previous[i] = j
+
+    indexes = set()
+    i = max(range(len(values)), key=lengths.__getitem__, default=None)
+    while i is not None:
+        indexes.add(i)
+        i = previous[i]
+    return indexes
+
+
+def format_field_diff(field: str, old_values: list[str], new_values: list[str]) -> str:
+    if len(old_values) == 1 and len(new_values) == 1:
+        return f"{field}: {old_values[0]} -> {new_values[0]}"
+
+    values = [click.style(f"-{v}", fg="red") for v in old_values if v not in new_values]
+    values += [
+        click.style(f"+{v}", fg="green") for v in new_values if v not in old_values
+    ]
+    return f"{field}: {' '.join(values)}"
+
+
+def print_chain_diff(
+    old: list[Certificate], new: list[Certificate], old_name: str, new_name: str
+) -> None:
+    click.secho("#############################################################")
+    print_field("Comparing", [f"- {old_name}", f"+ {new_name}"])
+
+    diff = diff_chains(old, new)
+    if diff is None:
+        click.secho("Identical chains", fg="green")
+        click.echo()
+        return
+
+    print_field(
+        "Removed",
+        [click.style(cert.subject.rfc4514_string(), fg="red") for cert in diff.removed],
+    )
+    print_field(
+        "Added",
+        [click.style(cert.subject.rfc4514_string(), fg="green") for cert in diff.added],
+    )
+    print_field(
+        "Reordered",
+        [
+            f"{cert.subject.rfc4514_string()}: {old_pos} -> {new_pos}"
+            for cert, old_pos, new_pos in diff.reordered
+        ],
+    )
+    for old_cert, _, fields in diff.changed:
+        print_field(
+            f"Changed: {old_cert.subject.rfc4514_string()}",
+            [format_field_diff(field, *values) for field, values in fields.items()],
+        )
+    click.echo()
+
+
+def print_cert_info(
+    cert: Certificate,
+    destination: str | IPv4Address | IPv6Address,
+    last_cert: Certificate | None,
+    issuer: Certificate | None = None,
+    ocsp_response: bytes | None = None,
+) -> Certificate:
+    fields = get_cert_fields(cert)
+    fields["Not after"] = [get_not_after_status(cert)]
+    if last_cert is None:
+        fields["SANs"] = [
+            click.style(san, fg="green")
+            if name_matches_destination(san, destination)
+            else san
+            for san in fields["SANs"]
+        ]
+    try:
+        scts = cert.extensions.get_extension_for_class(
+            PrecertificateSignedCertificateTimestamps
+        ).value
+    except ExtensionNotFound:
+        pass
+    else:
+        fields["SCTs"] = get_sct_info(list(scts), cert, issuer)
+
     click.secho("#############################################################")
 
-    print_field("Subject", [cert.subject.rfc4514_string()])
-    print_field("Issuer", [cert.issuer.rfc4514_string()])
-    print_field("Serial", [cert.serial_number])
-    print_field("Key type", [get_key_info(cert.public_key())])
-    print_field("Not before", [get_local_datetime(get_not_before(cert))])
-    print_field("Not after", [get_not_after_status(cert)])
-    print_field("SANs", sans)
-    print_field("SCTs", get_log_names(scts))
-    print_field("Type", [get_type(policies, is_ca=is_ca)])
-    print_field("Extended Key Usages", ekus)
-    print_field("Signature alg", [get_hash_algorithm_name(cert)])
-    print_field("SHA1", [cert.fingerprint(hashes.SHA1()).hex()])  # noqa:S303
-    print_field("SHA256", [cert.fingerprint(hashes.SHA256()).hex()])
+    for header, values in fields.items():
+        print_field(header, values)
+
+    if ocsp_response is not None:
+        print_ocsp_info(ocsp_response, cert, issuer)
 
     if cert.fingerprint(hashes.SHA256()).hex() in BAD_BUYPASS_CERTS:
         click.secho("This is a bad Buypass cert!", fg="red")
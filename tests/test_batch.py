@@ -0,0 +1,27 @@
+import io
+import json
+
+import certpeek
+
+
+def test_bad_host_line_does_not_stop_the_batch(capsys):
+    hosts = io.StringIO("a..ä\nexample.com:99999\n127.0.0.1:1\n")
+
+    certpeek.run_batch(
+        hosts,
+        None,
+        None,
+        no_servername=False,
+        complete_chain=False,
+        top=10,
+        state=None,
+        report_format="json",
+    )
+
+    captured = capsys.readouterr()
+    report = json.loads(captured.out)
+    assert report["hosts"] == 3
+    assert report["failed"] == 3
+    assert "Invalid host specified: a..ä" in captured.err
+    assert "Invalid port specified: example.com:99999" in captured.err
+    assert "127.0.0.1:1" in captured.err
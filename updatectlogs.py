@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Update the list of known CT logs
+Update the list of known CT logs, and their keys
 
 Run it like this:
 > ./updatectlogs.py
@@ -31,6 +31,7 @@ def main() -> None:
         for log in operator["logs"] + operator["tiled_logs"]
     ]
 
+    known_log_keys = {}
     for log in logs:
         sha256 = hashlib.sha256()
 
@@ -48,23 +49,36 @@ def main() -> None:
             # Bogus placeholder logs to unbreak misbehaving CT libraries
             continue
         KNOWN_LOGS.update({log_id: log_desc})
+        # Logs that are gone from the list are dropped, as
+        # there is no point in verifying SCTs from those.
+        known_log_keys[log_id] = b64encode(log_key).decode()
 
-    unformatted_new_known_logs_list = "KNOWN_LOGS="
-    unformatted_new_known_logs_list += str(
-        dict(sorted(KNOWN_LOGS.items(), key=itemgetter(1)))
+    new_known_logs_list = format_dict(
+        "KNOWN_LOGS", dict(sorted(KNOWN_LOGS.items(), key=itemgetter(1)))
     )
-    new_known_logs_list = subprocess.check_output(
-        ["ruff", "format", "--stdin-filename", "ctlist.py"],  # noqa: S607
-        input=unformatted_new_known_logs_list,
-        text=True,
+    new_known_log_keys_list = format_dict(
+        "KNOWN_LOG_KEYS: dict[str, str]", dict(sorted(known_log_keys.items()))
     )
 
     certpeek_source = CERTPEEK_SOURCE_FILE.read_text()
     new_certpeek_source = re.sub(
         r"KNOWN_LOGS = {[^}]+}\n", new_known_logs_list, certpeek_source
     )
+    new_certpeek_source = re.sub(
+        r"KNOWN_LOG_KEYS: dict\[str, str\] = {[^}]*}\n",
+        new_known_log_keys_list,
+        new_certpeek_source,
+    )
     CERTPEEK_SOURCE_FILE.write_text(new_certpeek_source)
 
 
+def format_dict(name: str, value: dict[str, str]) -> str:
+    return subprocess.check_output(
+        ["ruff", "format", "--stdin-filename", "ctlist.py"],  # noqa: S607
+        input=f"{name} = {value}",
+        text=True,
+    )
+
+
 if __name__ == "__main__":
     main()